@@ -1,25 +1,50 @@
 from universal_mcp.applications import APIApplication
 from universal_mcp.integrations import Integration
+import asyncio
 import logging
-import sys
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+import dns.asyncresolver
+import dns.entropy
+import dns.exception
+import dns.message
+import dns.rcode
 import dns.resolver
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
 from typing import Optional, Dict, Any
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stderr)
-    ]
-)
-
+# Handler configuration lives in the entrypoint (server.py); importing this
+# module has no logging side effects
 logger = logging.getLogger("domain_checker")
 
 # Constants
 RDAP_BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
 USER_AGENT = "DomainCheckerBot/1.0"
+PROBE_TIMEOUT = 6  # Wall-clock bound per domain probe (DNS + RDAP), in seconds
+RDAP_CACHE_TTL = 21600  # Registration data changes over days; cache hits for 6h
+RDAP_NEGATIVE_TTL = 300  # Re-check unregistered domains after 5 minutes
+DNS_CACHE_TTL = 300  # Mirrors a typical recursor TTL for keyword probes
+BOOTSTRAP_TTL = 86400  # IANA republishes the bootstrap registry infrequently
+BOOTSTRAP_CACHE_PATH = Path(tempfile.gettempdir()) / "domain_checker_rdap_bootstrap.json"
+
+RESOLVER_STRIKE_LIMIT = 3  # Consecutive timeouts before a resolver is benched
+RESOLVER_COOLDOWN = 60  # Seconds to skip a benched resolver before retrying
+
+# TLD groups for static RDAP routing
+_VERISIGN_TLDS = frozenset({"com", "net"})
+_NIC_TLDS = frozenset({"ch", "li"})
+
+# RDAP hosts worth pre-connecting: first contact otherwise pays
+# getaddrinfo plus a TLS handshake inside a user-visible request
+_WARM_RDAP_BASES = (
+    "https://rdap.verisign.com/",
+    "https://rdap.publicinterestregistry.org/",
+    "https://rdap.org/",
+)
 
 # Top TLDs to check
 TOP_TLDS = [
@@ -27,53 +52,392 @@ TOP_TLDS = [
     "me", "info", "xyz", "online", "site", "tech"
 ]
 
+@lru_cache(maxsize=256)
+def _rdap_base_for_tld(tld: str) -> str:
+    """Static RDAP base-URL routing, used when the bootstrap map lacks a TLD"""
+    if tld in _NIC_TLDS:
+        # Special case for .ch and .li domains
+        return f"https://rdap.nic.{tld}/"
+    if tld in _VERISIGN_TLDS:
+        return f"https://rdap.verisign.com/{tld}/v1/"
+    if tld == "org":
+        return "https://rdap.publicinterestregistry.org/rdap/"
+    return "https://rdap.org/"
+
+
+def _flatten_bootstrap(raw: Dict[str, Any]) -> Dict[str, str]:
+    """Flatten IANA's bootstrap `services` array into a tld -> base URL map"""
+    mapping = {}
+    for tlds, urls in raw.get("services", []):
+        base = next((url for url in urls if url.startswith("https://")), None)
+        if base is None and urls:
+            base = urls[0]
+        if not base:
+            continue
+        if not base.endswith("/"):
+            base += "/"
+        for tld in tlds:
+            mapping[tld.lower()] = base
+    return mapping
+
+
+class _PipelinedDnsProtocol(asyncio.DatagramProtocol):
+    """Routes pipelined DNS responses on a shared UDP socket by query id"""
+
+    def __init__(self) -> None:
+        self.futures: Dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            message = dns.message.from_wire(data)
+        except Exception:
+            return
+        future = self.futures.pop(message.id, None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def error_received(self, exc: Exception) -> None:
+        for future in self.futures.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.futures.clear()
+
+
 class DomainCheckerApp(APIApplication):
     """
     Base class for Universal MCP Applications.
     """
     def __init__(self, integration: Integration = None, **kwargs) -> None:
         super().__init__(name="domain-checker", integration=integration, **kwargs)
+        # Tunable wall-clock bounds so a stalled resolver or RDAP server
+        # fails fast instead of pinning a coroutine
+        self.dns_timeout = 2.0  # per-try resolver timeout
+        self.dns_lifetime = 3.0  # total budget per lookup
+        self.rdap_timeout = httpx.Timeout(4.0, connect=2.0)
+        # Shared async HTTP client so concurrent RDAP queries reuse
+        # pooled TLS connections instead of blocking the event loop
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=self.rdap_timeout,
+            headers={
+                "Accept": "application/rdap+json",
+                "User-Agent": USER_AGENT,
+            },
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+
+        # TTL caches so repeated checks on the same domain are dict lookups
+        # instead of HTTPS round-trips; misses are cached separately with a
+        # shorter TTL so a freshly registered domain shows up quickly
+        self._rdap_cache = TTLCache(maxsize=10_000, ttl=RDAP_CACHE_TTL)
+        self._rdap_negative_cache = TTLCache(maxsize=10_000, ttl=RDAP_NEGATIVE_TTL)
+        self._dns_cache = TTLCache(maxsize=50_000, ttl=DNS_CACHE_TTL)
+        # Async resolver so DNS lookups yield instead of blocking the loop
+        self._resolver = dns.asyncresolver.Resolver()
+        self._resolver.timeout = self.dns_timeout
+        self._resolver.lifetime = self.dns_lifetime
+        # Long-lived UDP channel for pipelined TLD sweeps; created lazily
+        # on the running loop
+        self._udp_transport = None
+        self._udp_protocol: Optional[_PipelinedDnsProtocol] = None
+        # Consecutive timeout counts per nameserver, so a dead resolver is
+        # skipped for a cool-down window instead of re-timing-out per probe
+        self._resolver_strikes: Dict[str, tuple] = {}
+        # IANA bootstrap map of tld -> RDAP base URL; loaded lazily so
+        # constructing the app never touches the network
+        self._rdap_map: Optional[Dict[str, str]] = None
+        self._rdap_map_loaded_at = 0.0
+        self._rdap_map_lock = asyncio.Lock()
+        # One-shot connection warm-up; runs on the first tool call since
+        # __init__ has no running loop
+        self._warmed = False
+        self._warm_tasks = set()
+        # In-flight probes per domain; concurrent callers share one result
+        # instead of issuing duplicate upstream queries
+        self._dns_inflight: Dict[str, asyncio.Task] = {}
+        self._rdap_inflight: Dict[str, asyncio.Task] = {}
+
+    async def _coalesce(self, inflight: Dict[str, asyncio.Task], domain: str, fetch):
+        """Single-flight wrapper: concurrent callers share one probe.
+
+        The probe runs in its own task and every caller awaits it through
+        asyncio.shield, so cancelling one caller (a probe timeout, a
+        disconnected client) never cancels the shared work out from under
+        the others.
+        """
+        task = inflight.get(domain)
+        if task is None:
+            task = asyncio.create_task(fetch(domain))
+            inflight[domain] = task
+            task.add_done_callback(lambda _: inflight.pop(domain, None))
+        return await asyncio.shield(task)
+
+    def _warm_connections(self) -> None:
+        """Pre-connect to the common RDAP hosts in the background.
+
+        Fire-and-forget HEAD requests populate the client's DNS cache and
+        connection pool, hiding the resolve + TLS handshake behind the rest
+        of the first request instead of serializing in front of it.
+        """
+        if self._warmed:
+            return
+        self._warmed = True
+        for base in _WARM_RDAP_BASES:
+            task = asyncio.create_task(self._warm_one(base))
+            self._warm_tasks.add(task)
+            task.add_done_callback(self._warm_tasks.discard)
+
+    async def _warm_one(self, base: str) -> None:
+        try:
+            await self._http.head(base)
+        except httpx.HTTPError:
+            pass
+
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections held by this app"""
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = None
+        # Cancel and drain any pending warm-up tasks before closing the
+        # client, so they don't die noisily against a closed client
+        if self._warm_tasks:
+            tasks = tuple(self._warm_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self._http.aclose()
+
+    async def _ensure_udp_channel(self) -> None:
+        """Open (or reopen) the shared UDP socket to the first nameserver"""
+        if self._udp_transport is not None and not self._udp_transport.is_closing():
+            return
+        loop = asyncio.get_running_loop()
+        nameserver = self._resolver.nameservers[0]
+        self._udp_transport, self._udp_protocol = await loop.create_datagram_endpoint(
+            _PipelinedDnsProtocol,
+            remote_addr=(str(nameserver), self._resolver.port),
+        )
+
+    async def _batch_check_dns(self, domains) -> Dict[str, Optional[bool]]:
+        """Resolve NS for many domains over one UDP socket.
+
+        Sends all queries back to back with distinct ids and matches the
+        responses as they arrive, so the whole batch costs one socket and
+        roughly one round-trip. Returns True/False per domain, or None when
+        the answer was ambiguous or timed out and the caller should fall
+        back to a per-domain lookup.
+        """
+        results: Dict[str, Optional[bool]] = {}
+        to_query = []
+        for domain in domains:
+            cached = self._dns_cache.get(domain)
+            if cached is not None:
+                results[domain] = cached
+            else:
+                results[domain] = None
+                to_query.append(domain)
+        if not to_query:
+            return results
+
+        try:
+            await self._ensure_udp_channel()
+        except OSError as e:
+            logger.error("Pipelined DNS channel unavailable: %s", e)
+            return results
+
+        loop = asyncio.get_running_loop()
+        protocol = self._udp_protocol
+        waiters = {}
+        for domain in to_query:
+            try:
+                query = dns.message.make_query(domain, 'NS')
+            except dns.exception.SyntaxError as e:
+                # Malformed name (empty label etc.); a definite non-result,
+                # consistent with per-domain failures elsewhere in the sweep
+                logger.warning("Skipping unparseable domain %s: %s", domain, e)
+                results[domain] = False
+                continue
+            # EDNS(0) with a 1232-byte payload avoids truncation-and-retry
+            # over TCP for large NS sets; multi-question packets would be
+            # tighter still but QDCOUNT > 1 is forbidden (RFC 9619), so the
+            # pipelined batch above is as close as the protocol allows
+            query.use_edns(0, payload=1232)
+            while query.id in protocol.futures:
+                query.id = dns.entropy.random_16()
+            future = loop.create_future()
+            protocol.futures[query.id] = future
+            waiters[domain] = (query.id, future)
+            self._udp_transport.sendto(query.to_wire())
+
+        if waiters:
+            await asyncio.wait(
+                [future for _, future in waiters.values()],
+                timeout=self._resolver.lifetime,
+            )
+
+        for domain, (query_id, future) in waiters.items():
+            if not future.done():
+                protocol.futures.pop(query_id, None)
+                future.cancel()
+                continue
+            if future.exception() is not None:
+                continue
+            message = future.result()
+            rcode = message.rcode()
+            if rcode == dns.rcode.NXDOMAIN:
+                results[domain] = False
+                self._dns_cache[domain] = False
+            elif rcode == dns.rcode.NOERROR and message.answer:
+                results[domain] = True
+                self._dns_cache[domain] = True
+        return results
+
+    async def _get_rdap_map(self) -> Dict[str, str]:
+        """Load the IANA RDAP bootstrap map, refreshing at most daily.
+
+        Prefers the in-memory copy, then a day-fresh on-disk cache, then a
+        network fetch. Returns the last known map (possibly empty) when the
+        registry is unreachable so callers can fall back to static routing.
+        """
+        if self._rdap_map is not None and time.time() - self._rdap_map_loaded_at < BOOTSTRAP_TTL:
+            return self._rdap_map
+
+        async with self._rdap_map_lock:
+            # Re-check under the lock: a concurrent sweep's first caller may
+            # have loaded the map while we waited
+            now = time.time()
+            if self._rdap_map is not None and now - self._rdap_map_loaded_at < BOOTSTRAP_TTL:
+                return self._rdap_map
+
+            try:
+                if (BOOTSTRAP_CACHE_PATH.exists()
+                        and now - BOOTSTRAP_CACHE_PATH.stat().st_mtime < BOOTSTRAP_TTL):
+                    raw = orjson.loads(BOOTSTRAP_CACHE_PATH.read_bytes())
+                    self._rdap_map = _flatten_bootstrap(raw)
+                    self._rdap_map_loaded_at = now
+                    return self._rdap_map
+            except (OSError, ValueError):
+                pass
+
+            try:
+                response = await self._http.get(RDAP_BOOTSTRAP_URL)
+                if response.status_code == 200:
+                    self._rdap_map = _flatten_bootstrap(orjson.loads(response.content))
+                    self._rdap_map_loaded_at = now
+                    try:
+                        BOOTSTRAP_CACHE_PATH.write_bytes(response.content)
+                    except OSError:
+                        pass
+                    return self._rdap_map
+            except Exception as e:
+                logger.error("RDAP bootstrap fetch failed: %s", e)
+
+            # Better a stale map than none at all
+            return self._rdap_map or {}
 
     async def get_rdap_data(self, domain: str) -> Optional[Dict[str, Any]]:
         """Get RDAP data for a domain"""
+        return await self._coalesce(self._rdap_inflight, domain, self._fetch_rdap_data)
+
+    async def _fetch_rdap_data(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Cache-then-network RDAP lookup; coalesced via get_rdap_data"""
+        cached = self._rdap_cache.get(domain)
+        if cached is not None:
+            return cached
+        if domain in self._rdap_negative_cache:
+            return None
+
         try:
-            # Special case for .ch and .li domains
-            tld = domain.split('.')[-1].lower()
-            if tld in ['ch', 'li']:
-                rdap_url = f"https://rdap.nic.{tld}/domain/{domain}"
-            else:
-                # Use common RDAP servers for known TLDs
-                if tld in ["com", "net"]:
-                    rdap_url = f"https://rdap.verisign.com/{tld}/v1/domain/{domain}"
-                elif tld == "org":
-                    rdap_url = f"https://rdap.publicinterestregistry.org/rdap/domain/{domain}"
-                else:
-                    rdap_url = f"https://rdap.org/domain/{domain}"
-            
-            headers = {
-                "Accept": "application/rdap+json",
-                "User-Agent": USER_AGENT
-            }
-            
-            response = requests.get(rdap_url, headers=headers, timeout=5)
+            # rpartition avoids the intermediate list that split would build
+            tld = domain.rpartition('.')[2].lower()
+            base = (await self._get_rdap_map()).get(tld) or _rdap_base_for_tld(tld)
+            rdap_url = f"{base}domain/{domain}"
+
+            response = await self._http.get(rdap_url)
             if response.status_code == 200:
-                return response.json()
+                data = orjson.loads(response.content)
+                self._rdap_cache[domain] = data
+                return data
+            if response.status_code == 404:
+                # Only a definitive not-found is worth negative-caching;
+                # rate limits and server errors stay uncached like
+                # transport failures
+                self._rdap_negative_cache[domain] = True
             return None
         except Exception as e:
-            logger.error(f"RDAP error for {domain}: {e}")
+            logger.error("RDAP error for %s: %s", domain, e)
             return None
 
+    def _resolver_on_cooldown(self) -> bool:
+        """Whether the active nameserver has struck out recently"""
+        nameserver = str(self._resolver.nameservers[0])
+        entry = self._resolver_strikes.get(nameserver)
+        if entry is None:
+            return False
+        strikes, last_failure = entry
+        if time.time() - last_failure >= RESOLVER_COOLDOWN:
+            self._resolver_strikes.pop(nameserver, None)
+            return False
+        return strikes >= RESOLVER_STRIKE_LIMIT
+
+    def _record_resolver_timeout(self) -> None:
+        nameserver = str(self._resolver.nameservers[0])
+        strikes, _ = self._resolver_strikes.get(nameserver, (0, 0.0))
+        self._resolver_strikes[nameserver] = (strikes + 1, time.time())
+        if strikes + 1 == RESOLVER_STRIKE_LIMIT:
+            logger.warning("Resolver %s benched for %ss", nameserver, RESOLVER_COOLDOWN)
+
+    def _record_resolver_success(self) -> None:
+        self._resolver_strikes.pop(str(self._resolver.nameservers[0]), None)
+
     async def check_dns(self, domain: str) -> bool:
         """Check if a domain has DNS records"""
+        return await self._coalesce(self._dns_inflight, domain, self._resolve_dns)
+
+    async def _resolve_dns(self, domain: str) -> bool:
+        """Cache-then-network DNS lookup; coalesced via check_dns"""
+        cached = self._dns_cache.get(domain)
+        if cached is not None:
+            return cached
+        if self._resolver_on_cooldown():
+            # Resolver is struggling; report negative (uncached) so the
+            # caller falls through to RDAP instead of waiting for timeouts
+            return False
+        # NS first: a registered domain is delegated even when it has no A
+        # record at the apex, so this answers in one round-trip for the
+        # common keyword-probe case
         try:
-            answers = dns.resolver.resolve(domain, 'A')
+            await asyncio.wait_for(
+                self._resolver.resolve(domain, 'NS'), timeout=self.dns_lifetime
+            )
+            self._record_resolver_success()
+            self._dns_cache[domain] = True
             return True
-        except:
-            try:
-                answers = dns.resolver.resolve(domain, 'NS')
-                return True
-            except:
-                return False
+        except dns.resolver.NXDOMAIN:
+            self._record_resolver_success()
+            self._dns_cache[domain] = False
+            return False
+        except (dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+            pass
+        except (dns.resolver.LifetimeTimeout, asyncio.TimeoutError):
+            self._record_resolver_timeout()
+        # Not delegated at this name (e.g. a host under a zone) or the
+        # resolver stalled; fall back to an A lookup
+        try:
+            await asyncio.wait_for(
+                self._resolver.resolve(domain, 'A'), timeout=self.dns_lifetime
+            )
+            self._record_resolver_success()
+            self._dns_cache[domain] = True
+            return True
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
+                dns.resolver.NoNameservers):
+            self._dns_cache[domain] = False
+            return False
+        except (dns.resolver.LifetimeTimeout, asyncio.TimeoutError):
+            # Transient resolver trouble; report negative but don't cache
+            self._record_resolver_timeout()
+            return False
 
     async def check_domain_tool(self, domain: str) -> Dict[str, Any]:
         """
@@ -106,22 +470,25 @@ class DomainCheckerApp(APIApplication):
         Tags:
             domain, availability, registration, dns, rdap, important
         """
-        logger.info(f"Checking domain: {domain}")
-        
-        # First check DNS
-        has_dns = await self.check_dns(domain)
+        logger.info("Checking domain: %s", domain)
+        self._warm_connections()
         
+        # DNS and RDAP are both needed whichever way the check goes, so
+        # run them concurrently and branch on the results
+        has_dns, rdap_data = await asyncio.gather(
+            self.check_dns(domain),
+            self.get_rdap_data(domain),
+        )
+
         if has_dns:
-            # Domain exists, get RDAP data if possible
-            rdap_data = await self.get_rdap_data(domain)
-            
             if rdap_data:
                 # Extract data from RDAP
                 registrar = "Unknown"
                 reg_date = "Unknown"
                 exp_date = "Unknown"
                 
-                # Extract registrar
+                # Extract registrar; stop at the first match rather than
+                # scanning the remaining entities
                 entities = rdap_data.get("entities", [])
                 for entity in entities:
                     if "registrar" in entity.get("roles", []):
@@ -131,14 +498,22 @@ class DomainCheckerApp(APIApplication):
                                 if entry[0] in ["fn", "org"] and len(entry) > 3:
                                     registrar = entry[3]
                                     break
-                
-                # Extract dates
+                        if registrar != "Unknown":
+                            break
+
+                # Extract dates; bail out once both are found
                 events = rdap_data.get("events", [])
+                found_reg = found_exp = False
                 for event in events:
-                    if event.get("eventAction") == "registration":
+                    action = event.get("eventAction")
+                    if action == "registration":
                         reg_date = event.get("eventDate", "Unknown")
-                    elif event.get("eventAction") == "expiration":
+                        found_reg = True
+                    elif action == "expiration":
                         exp_date = event.get("eventDate", "Unknown")
+                        found_exp = True
+                    if found_reg and found_exp:
+                        break
                 
                 return {
                     "domain": domain,
@@ -161,8 +536,7 @@ class DomainCheckerApp(APIApplication):
                     "note": "Domain has DNS records but RDAP data couldn't be retrieved"
                 }
         
-        # Try RDAP one more time even if DNS not found
-        rdap_data = await self.get_rdap_data(domain)
+        # No DNS, but the RDAP registry may still know the domain
         if rdap_data:
             return {
                 "domain": domain,
@@ -187,6 +561,23 @@ class DomainCheckerApp(APIApplication):
             "note": "No DNS records or RDAP data found"
         }
 
+    async def _probe(self, domain: str, has_dns: Optional[bool] = None) -> tuple:
+        """Probe a single domain and return (domain, taken) for the TLD sweep"""
+        try:
+            async with asyncio.timeout(PROBE_TIMEOUT):
+                if has_dns is None:
+                    has_dns = await self.check_dns(domain)
+                if has_dns:
+                    return (domain, True)
+                # Double-check with RDAP if no DNS
+                rdap_data = await self.get_rdap_data(domain)
+                return (domain, rdap_data is not None)
+        except asyncio.TimeoutError:
+            # Couldn't determine in time; treat as taken rather than
+            # falsely reporting the domain as available
+            logger.warning("Probe timed out for %s", domain)
+            return (domain, True)
+
     async def check_tlds_tool(self, keyword: str) -> Dict[str, Any]:
         """
         Checks a keyword across multiple top-level domains (TLDs) to find available domain names.
@@ -217,27 +608,29 @@ class DomainCheckerApp(APIApplication):
         Tags:
             tld, keyword, domain-search, availability, bulk-check, important
         """
-        logger.info(f"Checking keyword: {keyword} across TLDs")
+        logger.info("Checking keyword: %s across TLDs", keyword)
+        self._warm_connections()
         
-        results = []
         available = []
         taken = []
-        
-        # Check each TLD in sequence
-        for tld in TOP_TLDS:
-            domain = f"{keyword}.{tld}"
-            has_dns = await self.check_dns(domain)
-            
-            if not has_dns:
-                # Double-check with RDAP if no DNS
-                rdap_data = await self.get_rdap_data(domain)
-                if not rdap_data:
-                    available.append(domain)
-                else:
-                    taken.append(domain)
-            else:
+
+        # Resolve the whole sweep over one pipelined UDP socket first, then
+        # probe concurrently; only ambiguous domains re-resolve individually
+        domains = [f"{keyword}.{tld}" for tld in TOP_TLDS]
+        dns_results = await self._batch_check_dns(domains)
+        tasks = [self._probe(domain, has_dns=dns_results.get(domain)) for domain in domains]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                logger.error("Probe failed: %s", outcome)
+                continue
+            domain, is_taken = outcome
+            if is_taken:
                 taken.append(domain)
-        
+            else:
+                available.append(domain)
+
         return {
             "keyword": keyword,
             "tlds_checked": len(TOP_TLDS),
@@ -1,4 +1,7 @@
 
+import logging
+import sys
+
 from universal_mcp.servers import SingleMCPServer
 
 from universal_mcp_domain_checker.app import DomainCheckerApp
@@ -10,7 +13,14 @@ mcp = SingleMCPServer(
 )
 
 if __name__ == "__main__":
+    # Configure logging here rather than at app.py import time so embedding
+    # the app (tests, workers) doesn't stack duplicate handlers
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stderr)
+        ]
+    )
     print(f"Starting {mcp.name}...")
     mcp.run()
-
-